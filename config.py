@@ -0,0 +1,43 @@
+"""
+Application Settings
+
+Environment-derived configuration, loaded once at import. Handlers
+should read the module-level `settings` instance instead of calling
+os.getenv per request; missing values surface at startup, not mid-request.
+"""
+
+from functools import cached_property
+from typing import Optional
+
+from dotenv import load_dotenv
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+# Load environment variables from .env file
+load_dotenv()
+
+
+class Settings(BaseSettings):
+    model_config = SettingsConfigDict(frozen=True, extra="ignore")
+
+    # Auth
+    SECRET_KEY: str = "dev-secret-change-me"
+    ACCESS_TOKEN_EXPIRE_MINUTES: int = 43200  # 30 days default
+
+    # Database
+    DATABASE_URL: Optional[str] = None
+    DATABASE_NAME: Optional[str] = None
+
+    # Twilio
+    TWILIO_ACCOUNT_SID: Optional[str] = None
+    TWILIO_AUTH_TOKEN: Optional[str] = None
+    TWILIO_PHONE_NUMBER: Optional[str] = None
+    TWILIO_VALIDATE_SIGNATURE: bool = False
+    PUBLIC_BACKEND_URL: Optional[str] = None
+
+    @cached_property
+    def public_backend_url(self) -> Optional[str]:
+        """PUBLIC_BACKEND_URL without a trailing slash, ready for path concat."""
+        return self.PUBLIC_BACKEND_URL.rstrip("/") if self.PUBLIC_BACKEND_URL else None
+
+
+settings = Settings()
@@ -6,6 +6,9 @@ Import and use these functions in your API endpoints for database operations.
 """
 
 from pymongo import MongoClient
+from motor.motor_asyncio import AsyncIOMotorClient
+from bson import ObjectId
+from bson.codec_options import CodecOptions, TypeDecoder, TypeRegistry
 from datetime import datetime, timezone
 import os
 from dotenv import load_dotenv
@@ -17,13 +20,46 @@ load_dotenv()
 
 _client = None
 db = None
+_async_client = None
+adb = None
 
 database_url = os.getenv("DATABASE_URL")
 database_name = os.getenv("DATABASE_NAME")
 
+# Bounded pool sized for uvicorn workers under concurrent load; a short
+# wait-queue timeout surfaces pool exhaustion instead of piling up.
+_CLIENT_OPTIONS = dict(
+    maxPoolSize=50,
+    minPoolSize=5,
+    waitQueueTimeoutMS=2000,
+    retryWrites=True,
+)
+
+class _ObjectIdAsString(TypeDecoder):
+    """Decode ObjectId values straight to str at the BSON layer.
+
+    Every read path stringifies _id before returning it to clients, so
+    doing it once in the driver (in C, during decode) replaces the
+    per-document Python loops in the handlers. Writes are unaffected:
+    ObjectId still encodes as ObjectId.
+    """
+
+    bson_type = ObjectId
+
+    def transform_bson(self, value):
+        return str(value)
+
+
+_CODEC_OPTIONS = CodecOptions(type_registry=TypeRegistry([_ObjectIdAsString()]))
+
 if database_url and database_name:
-    _client = MongoClient(database_url)
-    db = _client[database_name]
+    _client = MongoClient(database_url, **_CLIENT_OPTIONS)
+    db = _client.get_database(database_name, codec_options=_CODEC_OPTIONS)
+    # Async (Motor) client for use inside async endpoints so Mongo I/O
+    # doesn't block the event loop. The sync client stays for scripts
+    # and non-async paths like /test.
+    _async_client = AsyncIOMotorClient(database_url, **_CLIENT_OPTIONS)
+    adb = _async_client.get_database(database_name, codec_options=_CODEC_OPTIONS)
 
 # Helper functions for common database operations
 def create_document(collection_name: str, data: Union[BaseModel, dict]):
@@ -43,13 +79,108 @@ def create_document(collection_name: str, data: Union[BaseModel, dict]):
     result = db[collection_name].insert_one(data_dict)
     return str(result.inserted_id)
 
-def get_documents(collection_name: str, filter_dict: dict = None, limit: int = None):
+def get_documents(collection_name: str, filter_dict: dict = None, limit: int = None, projection: dict = None):
     """Get documents from collection"""
     if db is None:
         raise Exception("Database not available. Check DATABASE_URL and DATABASE_NAME environment variables.")
-    
+
+    cursor = db[collection_name].find(filter_dict or {}, projection)
+    if limit:
+        cursor = cursor.limit(limit).batch_size(min(limit, 1000))
+
+    return list(cursor)
+
+async def acreate_document(collection_name: str, data: Union[BaseModel, dict]):
+    """Insert a single document with timestamp (async, via Motor)"""
+    if adb is None:
+        raise Exception("Database not available. Check DATABASE_URL and DATABASE_NAME environment variables.")
+
+    # Convert Pydantic model to dict if needed
+    if isinstance(data, BaseModel):
+        data_dict = data.model_dump()
+    else:
+        data_dict = data.copy()
+
+    data_dict['created_at'] = datetime.now(timezone.utc)
+    data_dict['updated_at'] = datetime.now(timezone.utc)
+
+    result = await adb[collection_name].insert_one(data_dict)
+    return str(result.inserted_id)
+
+async def acreate_documents(collection_name: str, docs: list):
+    """Insert several documents in one round-trip (async, via Motor)"""
+    if adb is None:
+        raise Exception("Database not available. Check DATABASE_URL and DATABASE_NAME environment variables.")
+
+    now = datetime.now(timezone.utc)
+    payload = []
+    for data in docs:
+        data_dict = data.model_dump() if isinstance(data, BaseModel) else data.copy()
+        data_dict['created_at'] = now
+        data_dict['updated_at'] = now
+        payload.append(data_dict)
+
+    result = await adb[collection_name].insert_many(payload, ordered=False)
+    return [str(inserted_id) for inserted_id in result.inserted_ids]
+
+async def aget_documents(collection_name: str, filter_dict: dict = None, limit: int = None, projection: dict = None, sort: list = None):
+    """Get documents from collection (async, via Motor)"""
+    if adb is None:
+        raise Exception("Database not available. Check DATABASE_URL and DATABASE_NAME environment variables.")
+
+    cursor = adb[collection_name].find(filter_dict or {}, projection)
+    if sort:
+        cursor = cursor.sort(sort)
+    # Treat zero/negative limits as "no limit": Motor's to_list raises on
+    # negative lengths, unlike the sync driver's single-batch semantics.
+    if limit and limit > 0:
+        cursor = cursor.limit(limit)
+    else:
+        limit = None
+
+    return await cursor.to_list(length=limit)
+
+async def aaggregate(collection_name: str, pipeline: list, limit: int = None):
+    """Run an aggregation pipeline and return the results (async, via Motor)"""
+    if adb is None:
+        raise Exception("Database not available. Check DATABASE_URL and DATABASE_NAME environment variables.")
+
+    cursor = adb[collection_name].aggregate(pipeline)
+    return await cursor.to_list(length=limit)
+
+def iter_documents(collection_name: str, filter_dict: dict = None, limit: int = None, batch_size: int = 500, sort: list = None):
+    """Get a lazy cursor over documents instead of materializing a list.
+
+    Useful for streaming large result sets (e.g. CSV export) without
+    holding every document in memory at once.
+    """
+    if db is None:
+        raise Exception("Database not available. Check DATABASE_URL and DATABASE_NAME environment variables.")
+
     cursor = db[collection_name].find(filter_dict or {})
+    if sort:
+        cursor = cursor.sort(sort)
     if limit:
         cursor = cursor.limit(limit)
-    
-    return list(cursor)
+
+    return cursor.batch_size(batch_size)
+
+def ensure_indexes():
+    """Create the indexes backing the list/export reads (idempotent)."""
+    if db is None:
+        return
+    for collection_name in ("lead", "chatmessage", "booking", "supportticket",
+                            "paymentrecord", "smsmessage", "calllog"):
+        db[collection_name].create_index([("created_at", -1)])
+    # Fields the API filters on (or will, once dashboards add filters).
+    # session_id is not unique: most paymentrecord docs don't carry one,
+    # and missing values would collide under a unique index.
+    db["lead"].create_index("email")
+    db["smsmessage"].create_index("sid")
+    db["calllog"].create_index("sid")
+    db["paymentrecord"].create_index("session_id")
+    # Auth lookups: login/get_current_user fetch by email on every
+    # request, and uniqueness backs the signup duplicate check.
+    db["authuser"].create_index("email", unique=True)
+    db["membership"].create_index("user_email")
+    db["membership"].create_index([("user_email", 1), ("org_id", 1)], unique=True)
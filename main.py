@@ -1,13 +1,24 @@
+import csv
+import io
 import os
+import requests
+from functools import lru_cache
 from typing import List, Optional, Dict, Any
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 
+import orjson
 from fastapi import FastAPI, HTTPException, Request, Depends
+from fastapi.concurrency import run_in_threadpool
+from fastapi.routing import APIRoute
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import PlainTextResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, PlainTextResponse, StreamingResponse
 from pydantic import BaseModel, EmailStr
+from cachetools import TTLCache
 
-from database import db, create_document, get_documents
+from config import settings
+from database import db, adb, aaggregate, acreate_document, acreate_documents, aget_documents, iter_documents, ensure_indexes
+from writer import insert_buffer
 from schemas import (
     Lead, ChatMessage, Booking, SupportTicket, PaymentRecord,
     SmsMessage, CallLog,
@@ -21,12 +32,40 @@ from twilio.twiml.voice_response import VoiceResponse, Gather
 from twilio.request_validator import RequestValidator
 
 # JWT + password hashing
-import jwt
+import base64
 import hashlib
-import secrets
+import hmac
+import time
+from argon2 import PasswordHasher
+from argon2.exceptions import VerifyMismatchError
 from bson import ObjectId
 
-app = FastAPI(title="AHC Front Desk Assistant API")
+class _ORJSONRequest(Request):
+    """Request whose json() parses the body with orjson instead of stdlib json."""
+
+    async def json(self) -> Any:
+        if not hasattr(self, "_json"):
+            self._json = orjson.loads(await self.body())
+        return self._json
+
+
+class _ORJSONRoute(APIRoute):
+    """Route class that hands handlers the orjson-parsing request."""
+
+    def get_route_handler(self):
+        original = super().get_route_handler()
+
+        async def handler(request: Request):
+            return await original(_ORJSONRequest(request.scope, request.receive))
+
+        return handler
+
+
+# orjson on both sides of the wire: responses via ORJSONResponse and
+# request-body parsing via the custom route class. The route class must
+# be set before any @app decorators run, or those routes keep the default.
+app = FastAPI(title="AHC Front Desk Assistant API", default_response_class=ORJSONResponse)
+app.router.route_class = _ORJSONRoute
 
 app.add_middleware(
     CORSMiddleware,
@@ -36,36 +75,111 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# CSV exports and the larger JSON lists are highly compressible text;
+# gzip them once they pass 1 KiB. Streaming responses compress chunk by
+# chunk, so export memory stays bounded.
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
 
 # ------------------------------------------------------
 # Auth helpers (password hashing + JWT)
 # ------------------------------------------------------
-SECRET_KEY = os.getenv("SECRET_KEY", "dev-secret-change-me")
-ALGORITHM = "HS256"
-ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "43200"))  # 30 days default
+SECRET_KEY = settings.SECRET_KEY
+ACCESS_TOKEN_EXPIRE_MINUTES = settings.ACCESS_TOKEN_EXPIRE_MINUTES
+
+# Hand-rolled HS256 JWT. We only ever issue HS256 tokens against one
+# fixed key, so the header and signing key are precomputed and each
+# encode is a single hmac + two base64url passes — no per-call algorithm
+# negotiation or options parsing.
+_SIGNING_KEY = SECRET_KEY.encode("utf-8")
+_JWT_HEADER_B64 = base64.urlsafe_b64encode(b'{"alg":"HS256","typ":"JWT"}').rstrip(b"=")
+
+
+def _b64url_encode(raw: bytes) -> bytes:
+    return base64.urlsafe_b64encode(raw).rstrip(b"=")
+
+
+def _b64url_decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+def _jwt_encode(payload: dict) -> str:
+    signing_input = _JWT_HEADER_B64 + b"." + _b64url_encode(orjson.dumps(payload))
+    signature = hmac.new(_SIGNING_KEY, signing_input, hashlib.sha256).digest()
+    return (signing_input + b"." + _b64url_encode(signature)).decode("ascii")
 
 
-def hash_password(password: str, salt: Optional[str] = None) -> Dict[str, str]:
-    salt = salt or secrets.token_hex(16)
-    pwd_hash = hashlib.pbkdf2_hmac(
+def _jwt_decode(token: str) -> dict:
+    """Verify an HS256 token and return its payload.
+
+    Raises ValueError on any malformed, forged, wrong-algorithm, or
+    expired token. Header bytes are parsed (not compared literally) so
+    tokens issued by PyJWT before the switch keep verifying.
+    """
+    try:
+        signing_input, _, signature_b64 = token.rpartition(".")
+        header_b64, _, payload_b64 = signing_input.partition(".")
+        header = orjson.loads(_b64url_decode(header_b64))
+        if header.get("alg") != "HS256":
+            raise ValueError("unexpected algorithm")
+        expected = hmac.new(_SIGNING_KEY, signing_input.encode("ascii"), hashlib.sha256).digest()
+        if not hmac.compare_digest(expected, _b64url_decode(signature_b64)):
+            raise ValueError("bad signature")
+        payload = orjson.loads(_b64url_decode(payload_b64))
+    except ValueError:
+        raise
+    except Exception:
+        raise ValueError("malformed token")
+    exp = payload.get("exp")
+    if exp is not None and int(exp) < time.time():
+        raise ValueError("token expired")
+    return payload
+
+
+# Argon2id with the library defaults (memory-hard, self-describing hash
+# string, salt embedded) — one password_hash field per user. Records
+# written before the switch carry a password_salt and are verified with
+# the old PBKDF2 scheme, then upgraded on their next successful login.
+_password_hasher = PasswordHasher()
+
+
+def hash_password(password: str) -> str:
+    return _password_hasher.hash(password)
+
+
+def _legacy_pbkdf2_hash(password: str, salt: str) -> str:
+    return hashlib.pbkdf2_hmac(
         "sha256",
         password.encode("utf-8"),
         bytes.fromhex(salt),
         100_000,
         dklen=32,
     ).hex()
-    return {"salt": salt, "hash": pwd_hash}
 
 
-def verify_password(password: str, salt: str, expected_hash: str) -> bool:
-    return hash_password(password, salt)["hash"] == expected_hash
+def verify_password(password: str, user: Dict[str, Any]) -> bool:
+    salt = user.get("password_salt")
+    if salt:
+        # Constant-time compare; == leaks a timing oracle on the digest.
+        return hmac.compare_digest(_legacy_pbkdf2_hash(password, salt), user.get("password_hash", ""))
+    try:
+        return _password_hasher.verify(user.get("password_hash", ""), password)
+    except VerifyMismatchError:
+        return False
+    except Exception:
+        return False
+
+
+_ACCESS_TOKEN_TTL_SECONDS = ACCESS_TOKEN_EXPIRE_MINUTES * 60
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
+    # exp is epoch seconds anyway; integer math beats building and
+    # converting datetime objects per token.
     to_encode = data.copy()
-    expire = datetime.utcnow() + (expires_delta or timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES))
-    to_encode.update({"exp": expire})
-    return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    ttl = int(expires_delta.total_seconds()) if expires_delta else _ACCESS_TOKEN_TTL_SECONDS
+    to_encode["exp"] = int(time.time()) + ttl
+    return _jwt_encode(to_encode)
 
 
 class TokenResponse(BaseModel):
@@ -74,29 +188,43 @@ class TokenResponse(BaseModel):
     user: Dict[str, Any]
 
 
+# Every authenticated endpoint re-verifies the same bearer token and
+# re-fetches the same user; cache the sanitized result briefly, keyed by
+# a digest of the token (never the raw token). Failures are not cached,
+# so a bad token is re-checked every time.
+_auth_cache = TTLCache(maxsize=10_000, ttl=5)
+
+# Only what callers of get_current_user actually use; the password
+# fields never leave Mongo, so there's nothing to strip afterwards.
+_AUTH_USER_PROJECTION = {"name": 1, "email": 1, "is_active": 1}
+
+
 async def get_current_user(request: Request) -> Dict[str, Any]:
     auth_header = request.headers.get("Authorization", "")
     if not auth_header.startswith("Bearer "):
         raise HTTPException(status_code=401, detail="Not authenticated")
     token = auth_header.split(" ", 1)[1]
+
+    cache_key = hashlib.sha256(token.encode("utf-8")).digest()
+    cached = _auth_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-    except Exception:
+        payload = _jwt_decode(token)
+    except ValueError:
         raise HTTPException(status_code=401, detail="Invalid token")
 
     email = payload.get("sub")
     if not email:
         raise HTTPException(status_code=401, detail="Invalid token payload")
 
-    users = get_documents("authuser", {"email": email}, 1)
+    users = await aget_documents("authuser", {"email": email}, 1, projection=_AUTH_USER_PROJECTION)
     if not users:
         raise HTTPException(status_code=401, detail="User not found")
 
     user = users[0]
-    user["_id"] = str(user.get("_id"))
-    # remove sensitive
-    user.pop("password_hash", None)
-    user.pop("password_salt", None)
+    _auth_cache[cache_key] = user
     return user
 
 
@@ -104,41 +232,73 @@ async def get_current_user(request: Request) -> Dict[str, Any]:
 # Twilio helpers
 # ------------------------------------------------------
 
+@lru_cache(maxsize=1)
+def _twilio_client(account_sid: str, auth_token: str) -> TwilioClient:
+    # Cached so the underlying requests.Session (and its keep-alive
+    # connection pool) is reused across requests instead of paying a
+    # fresh TCP+TLS handshake per API call.
+    client = TwilioClient(account_sid, auth_token)
+    # Widen the session pool so bursts of concurrent sends reuse
+    # keep-alive sockets instead of opening fresh TLS connections.
+    adapter = requests.adapters.HTTPAdapter(pool_connections=10, pool_maxsize=20)
+    client.http_client.session.mount("https://", adapter)
+    return client
+
+
 def get_twilio_client():
-    account_sid = os.getenv("TWILIO_ACCOUNT_SID")
-    auth_token = os.getenv("TWILIO_AUTH_TOKEN")
+    account_sid = settings.TWILIO_ACCOUNT_SID
+    auth_token = settings.TWILIO_AUTH_TOKEN
     if not account_sid or not auth_token:
         raise HTTPException(status_code=500, detail="Twilio credentials not configured")
-    return TwilioClient(account_sid, auth_token)
+    return _twilio_client(account_sid, auth_token)
+
+
+@lru_cache(maxsize=1)
+def _twilio_validator(auth_token: str) -> RequestValidator:
+    # Stateless w.r.t. the request; no need to rebuild per webhook.
+    return RequestValidator(auth_token)
+
 
+# Evaluated once at import: enforcement requires both the opt-in flag
+# and a token to validate against. Settings are frozen, so webhooks can
+# branch on this constant instead of re-reading config per request.
+_ENFORCE_TWILIO_SIGNATURE = bool(settings.TWILIO_VALIDATE_SIGNATURE and settings.TWILIO_AUTH_TOKEN)
 
-def validate_twilio_request(request: Request, form_dict: dict) -> bool:
+
+def validate_twilio_request(request: Request, form) -> bool:
     """Validate X-Twilio-Signature when enabled.
     Set TWILIO_VALIDATE_SIGNATURE=true to enforce validation.
     Uses TWILIO_AUTH_TOKEN.
     """
-    enforce = os.getenv("TWILIO_VALIDATE_SIGNATURE", "false").lower() == "true"
-    auth_token = os.getenv("TWILIO_AUTH_TOKEN")
-    if not enforce or not auth_token:
+    if not _ENFORCE_TWILIO_SIGNATURE:
         return True
 
     signature = request.headers.get("X-Twilio-Signature")
     if not signature:
         return False
 
-    validator = RequestValidator(auth_token)
+    validator = _twilio_validator(settings.TWILIO_AUTH_TOKEN)
 
-    # Try to validate using the exact URL Twilio called
+    # Twilio signs the public URL it called. Behind a proxy that is the
+    # forwarded scheme/host rather than request.url, so reconstruct the
+    # signed URL up front instead of paying the HMAC twice per webhook.
     url_used = str(request.url)
-    valid = validator.validate(url_used, form_dict, signature)
-    if valid:
+    proto = request.headers.get("X-Forwarded-Proto")
+    host = request.headers.get("X-Forwarded-Host") or request.headers.get("Host")
+    if proto and host:
+        url_used = f"{proto}://{host}{request.url.path}"
+        if request.url.query:
+            url_used += f"?{request.url.query}"
+    elif settings.public_backend_url:
+        url_used = settings.public_backend_url + str(request.url.path)
+
+    if validator.validate(url_used, form, signature):
         return True
 
-    # Fallback: validate against PUBLIC_BACKEND_URL + path (useful behind proxies)
-    base_url = os.getenv("PUBLIC_BACKEND_URL")
-    if base_url:
-        alt_url = base_url.rstrip("/") + str(request.url.path)
-        return validator.validate(alt_url, form_dict, signature)
+    # Last resort for direct, unproxied calls where the headers lied.
+    fallback_url = str(request.url)
+    if fallback_url != url_used:
+        return validator.validate(fallback_url, form, signature)
     return False
 
 
@@ -147,13 +307,35 @@ def read_root():
     return {"message": "AHC Front Desk Assistant API running"}
 
 
+# Env presence can't change at runtime; build the cosmetic strings once.
+_ENV_STATUS = {
+    "database_url": "✅ Set" if settings.DATABASE_URL else "❌ Not Set",
+    "database_name": "✅ Set" if settings.DATABASE_NAME else "❌ Not Set",
+    "twilio_account_sid": "✅ Set" if settings.TWILIO_ACCOUNT_SID else "❌ Not Set",
+    "twilio_auth_token": "✅ Set" if settings.TWILIO_AUTH_TOKEN else "❌ Not Set",
+    "twilio_phone_number": "✅ Set" if settings.TWILIO_PHONE_NUMBER else "❌ Not Set",
+    "twilio_validate_signature": str(settings.TWILIO_VALIDATE_SIGNATURE).lower(),
+    "auth_secret_key": "✅ Set" if settings.SECRET_KEY != "dev-secret-change-me" else "⚠️ Using default",
+}
+
+# /test doubles as a liveness probe; don't re-list collections on every
+# poll when a cheap ping proves the connection.
+_collections_cache = TTLCache(maxsize=1, ttl=30)
+
+
+def _cached_collection_names():
+    names = _collections_cache.get("names")
+    if names is None:
+        names = db.list_collection_names()
+        _collections_cache["names"] = names
+    return names
+
+
 @app.get("/test")
 def test_database():
     response = {
         "backend": "✅ Running",
         "database": "❌ Not Available",
-        "database_url": None,
-        "database_name": None,
         "connection_status": "Not Connected",
         "collections": []
     }
@@ -161,12 +343,10 @@ def test_database():
     try:
         if db is not None:
             response["database"] = "✅ Available"
-            response["database_url"] = "✅ Configured"
-            response["database_name"] = getattr(db, 'name', '✅ Connected')
             response["connection_status"] = "Connected"
             try:
-                collections = db.list_collection_names()
-                response["collections"] = collections[:10]
+                db.command("ping")  # cheap liveness round-trip
+                response["collections"] = _cached_collection_names()[:10]
                 response["database"] = "✅ Connected & Working"
             except Exception as e:
                 response["database"] = f"⚠️  Connected but Error: {str(e)[:50]}"
@@ -175,17 +355,7 @@ def test_database():
     except Exception as e:
         response["database"] = f"❌ Error: {str(e)[:50]}"
 
-    response["database_url"] = "✅ Set" if os.getenv("DATABASE_URL") else "❌ Not Set"
-    response["database_name"] = "✅ Set" if os.getenv("DATABASE_NAME") else "❌ Not Set"
-
-    # Twilio env presence
-    response["twilio_account_sid"] = "✅ Set" if os.getenv("TWILIO_ACCOUNT_SID") else "❌ Not Set"
-    response["twilio_auth_token"] = "✅ Set" if os.getenv("TWILIO_AUTH_TOKEN") else "❌ Not Set"
-    response["twilio_phone_number"] = "✅ Set" if os.getenv("TWILIO_PHONE_NUMBER") else "❌ Not Set"
-    response["twilio_validate_signature"] = os.getenv("TWILIO_VALIDATE_SIGNATURE", "false")
-
-    # Auth presence
-    response["auth_secret_key"] = "✅ Set" if os.getenv("SECRET_KEY") else "⚠️ Using default"
+    response.update(_ENV_STATUS)
 
     return response
 
@@ -206,19 +376,19 @@ class LoginRequest(BaseModel):
 
 @app.post("/auth/signup", response_model=TokenResponse)
 async def auth_signup(req: SignupRequest):
-    existing = get_documents("authuser", {"email": req.email.lower()}, 1)
+    existing = await aget_documents("authuser", {"email": req.email.lower()}, 1)
     if existing:
         raise HTTPException(status_code=400, detail="User already exists")
 
-    hp = hash_password(req.password)
+    # Argon2id is deliberately expensive; keep it off the event loop.
+    password_hash = await run_in_threadpool(hash_password, req.password)
     user_doc = {
         "name": req.name,
         "email": req.email.lower(),
-        "password_hash": hp["hash"],
-        "password_salt": hp["salt"],
+        "password_hash": password_hash,
         "is_active": True,
     }
-    _id = create_document("authuser", user_doc)
+    _id = await acreate_document("authuser", user_doc)
 
     token = create_access_token({"sub": req.email.lower()})
     safe_user = {"id": _id, "name": req.name, "email": req.email.lower()}
@@ -227,15 +397,30 @@ async def auth_signup(req: SignupRequest):
 
 @app.post("/auth/login", response_model=TokenResponse)
 async def auth_login(req: LoginRequest):
-    users = get_documents("authuser", {"email": req.email.lower()}, 1)
+    users = await aget_documents("authuser", {"email": req.email.lower()}, 1)
     if not users:
         raise HTTPException(status_code=400, detail="Invalid credentials")
     user = users[0]
-    if not verify_password(req.password, user.get("password_salt", ""), user.get("password_hash", "")):
+    if not await run_in_threadpool(verify_password, req.password, user):
         raise HTTPException(status_code=400, detail="Invalid credentials")
 
+    if user.get("password_salt"):
+        # Legacy PBKDF2 record: transparently upgrade to Argon2id while
+        # we have the plaintext, dropping the separate salt field.
+        try:
+            new_hash = await run_in_threadpool(hash_password, req.password)
+            await adb["authuser"].update_one(
+                {"_id": ObjectId(user["_id"])},
+                {
+                    "$set": {"password_hash": new_hash, "updated_at": datetime.now(timezone.utc)},
+                    "$unset": {"password_salt": ""},
+                },
+            )
+        except Exception:
+            pass
+
     token = create_access_token({"sub": user["email"]})
-    safe_user = {"id": str(user.get("_id")), "name": user.get("name"), "email": user.get("email")}
+    safe_user = {"id": user.get("_id"), "name": user.get("name"), "email": user.get("email")}
     return TokenResponse(access_token=token, user=safe_user)
 
 
@@ -258,9 +443,9 @@ async def create_org(req: OrgCreateRequest, current_user: Dict[str, Any] = Depen
         "name": req.name,
         "owner_email": current_user["email"],
     }
-    org_id = create_document("organization", org)
+    org_id = await acreate_document("organization", org)
 
-    create_document("membership", {
+    await acreate_document("membership", {
         "user_email": current_user["email"],
         "org_id": org_id,
         "role": "admin",
@@ -271,20 +456,74 @@ async def create_org(req: OrgCreateRequest, current_user: Dict[str, Any] = Depen
 
 @app.get("/orgs/mine")
 async def list_my_orgs(current_user: Dict[str, Any] = Depends(get_current_user)):
-    memberships = get_documents("membership", {"user_email": current_user["email"]}, 100)
-    org_ids = [m.get("org_id") for m in memberships if m.get("org_id")]
-    if not org_ids:
-        return []
+    # One round-trip: join memberships to their organizations server-side
+    # instead of fetching membership ids and querying organizations again.
+    # org_id is stored as a string, so convert it before matching _id;
+    # onError/onNull drop malformed ids rather than failing the pipeline.
+    pipeline = [
+        {"$match": {"user_email": current_user["email"]}},
+        {"$limit": 100},
+        {"$lookup": {
+            "from": "organization",
+            "let": {"org_id": {"$convert": {
+                "input": "$org_id", "to": "objectId",
+                "onError": None, "onNull": None,
+            }}},
+            "pipeline": [{"$match": {"$expr": {"$eq": ["$_id", "$$org_id"]}}}],
+            "as": "org",
+        }},
+        {"$unwind": "$org"},
+        {"$replaceRoot": {"newRoot": "$org"}},
+    ]
+    return await aaggregate("membership", pipeline, limit=100)
+
+
+# ------------------------------------------------------
+# Short-TTL cache for dashboard list endpoints
+# ------------------------------------------------------
+# Dashboards poll these GETs with identical queries; a few seconds of
+# staleness is fine and saves the Mongo round-trip entirely.
+_list_cache = TTLCache(maxsize=128, ttl=5)
+
+# Dashboards want "latest N"; backed by the created_at indexes that
+# ensure_indexes() creates on startup.
+_RECENT_FIRST = [("created_at", -1)]
 
-    # Convert to ObjectId list for query
-    try:
-        oids = [ObjectId(oid) for oid in org_ids]
-    except Exception:
-        oids = []
-    orgs = get_documents("organization", {"_id": {"$in": oids}}, 100)
-    for o in orgs:
-        o["_id"] = str(o.get("_id"))
-    return orgs
+
+@app.on_event("startup")
+async def _create_indexes():
+    if db is not None:
+        await run_in_threadpool(ensure_indexes)
+
+
+@app.on_event("startup")
+async def _start_insert_buffer():
+    if adb is not None:
+        insert_buffer.start()
+
+
+def _projection_for(model) -> Dict[str, int]:
+    # Only the schema fields plus the create_document timestamps; _id is
+    # included by Mongo automatically. Keeps stray fields off the wire.
+    fields = {name: 1 for name in model.model_fields}
+    fields.update({"created_at": 1, "updated_at": 1})
+    return fields
+
+
+_LIST_PROJECTIONS = {
+    "lead": _projection_for(Lead),
+    "chatmessage": _projection_for(ChatMessage),
+    "booking": _projection_for(Booking),
+    "supportticket": _projection_for(SupportTicket),
+    "paymentrecord": _projection_for(PaymentRecord),
+    "smsmessage": _projection_for(SmsMessage),
+    "calllog": _projection_for(CallLog),
+}
+
+
+def _invalidate_list_cache(collection_name: str):
+    for key in [k for k in _list_cache if k[0] == collection_name]:
+        _list_cache.pop(key, None)
 
 
 # ------------------------------------------------------
@@ -293,16 +532,19 @@ async def list_my_orgs(current_user: Dict[str, Any] = Depends(get_current_user))
 
 @app.post("/leads")
 async def create_lead(lead: Lead):
-    lead_id = create_document("lead", lead)
+    lead_id = await insert_buffer.submit("lead", lead)
+    _invalidate_list_cache("lead")
     return {"id": lead_id, "status": "saved"}
 
 
 @app.get("/leads")
 async def list_leads(limit: int = 100):
-    docs = get_documents("lead", {}, limit)
-    # Convert ObjectId to string
-    for d in docs:
-        d["_id"] = str(d.get("_id"))
+    key = ("lead", limit)
+    cached = _list_cache.get(key)
+    if cached is not None:
+        return cached
+    docs = await aget_documents("lead", {}, limit, projection=_LIST_PROJECTIONS["lead"], sort=_RECENT_FIRST)
+    _list_cache[key] = docs
     return docs
 
 # ------------------------------------------------------
@@ -311,15 +553,19 @@ async def list_leads(limit: int = 100):
 
 @app.post("/chats")
 async def add_chat_message(msg: ChatMessage):
-    msg_id = create_document("chatmessage", msg)
+    msg_id = await insert_buffer.submit("chatmessage", msg)
+    _invalidate_list_cache("chatmessage")
     return {"id": msg_id}
 
 
 @app.get("/chats")
 async def list_chats(limit: int = 200):
-    docs = get_documents("chatmessage", {}, limit)
-    for d in docs:
-        d["_id"] = str(d.get("_id"))
+    key = ("chatmessage", limit)
+    cached = _list_cache.get(key)
+    if cached is not None:
+        return cached
+    docs = await aget_documents("chatmessage", {}, limit, projection=_LIST_PROJECTIONS["chatmessage"], sort=_RECENT_FIRST)
+    _list_cache[key] = docs
     return docs
 
 # ------------------------------------------------------
@@ -328,16 +574,20 @@ async def list_chats(limit: int = 200):
 
 @app.post("/bookings")
 async def create_booking(booking: Booking):
-    booking_id = create_document("booking", booking)
+    booking_id = await insert_buffer.submit("booking", booking)
     # In a real app, send confirmation email + calendar invite here
+    _invalidate_list_cache("booking")
     return {"id": booking_id, "status": "scheduled"}
 
 
 @app.get("/bookings")
 async def list_bookings(limit: int = 100):
-    docs = get_documents("booking", {}, limit)
-    for d in docs:
-        d["_id"] = str(d.get("_id"))
+    key = ("booking", limit)
+    cached = _list_cache.get(key)
+    if cached is not None:
+        return cached
+    docs = await aget_documents("booking", {}, limit, projection=_LIST_PROJECTIONS["booking"], sort=_RECENT_FIRST)
+    _list_cache[key] = docs
     return docs
 
 # ------------------------------------------------------
@@ -346,16 +596,20 @@ async def list_bookings(limit: int = 100):
 
 @app.post("/tickets")
 async def create_ticket(ticket: SupportTicket):
-    ticket_id = create_document("supportticket", ticket)
+    ticket_id = await insert_buffer.submit("supportticket", ticket)
     # In a real app: auto-assign based on issue_type and notify team
+    _invalidate_list_cache("supportticket")
     return {"id": ticket_id, "status": "created"}
 
 
 @app.get("/tickets")
 async def list_tickets(limit: int = 100):
-    docs = get_documents("supportticket", {}, limit)
-    for d in docs:
-        d["_id"] = str(d.get("_id"))
+    key = ("supportticket", limit)
+    cached = _list_cache.get(key)
+    if cached is not None:
+        return cached
+    docs = await aget_documents("supportticket", {}, limit, projection=_LIST_PROJECTIONS["supportticket"], sort=_RECENT_FIRST)
+    _list_cache[key] = docs
     return docs
 
 # ------------------------------------------------------
@@ -382,7 +636,7 @@ async def create_checkout(req: CheckoutRequest):
         provider="stripe",
         checkout_session_id="sess_mock_123"
     )
-    rec_id = create_document("paymentrecord", record)
+    rec_id = await insert_buffer.submit("paymentrecord", record)
     return {
         "checkout_url": "https://checkout.stripe.com/pay/mock-session",
         "session_id": "sess_mock_123",
@@ -393,7 +647,7 @@ async def create_checkout(req: CheckoutRequest):
 @app.post("/checkout/confirm/{session_id}")
 async def confirm_checkout(session_id: str):
     # Placeholder confirmation; in real use, verify via webhook
-    create_document("paymentrecord", {
+    await insert_buffer.submit("paymentrecord", {
         "session_id": session_id,
         "status": "succeeded",
         "provider": "stripe"
@@ -403,50 +657,82 @@ async def confirm_checkout(session_id: str):
 
 @app.get("/payments")
 async def list_payments(limit: int = 100):
-    docs = get_documents("paymentrecord", {}, limit)
-    for d in docs:
-        d["_id"] = str(d.get("_id"))
+    docs = await aget_documents("paymentrecord", {}, limit, projection=_LIST_PROJECTIONS["paymentrecord"], sort=_RECENT_FIRST)
     return docs
 
 # ------------------------------------------------------
 # CSV export for analytics
 # ------------------------------------------------------
 
-@app.get("/export/{resource}")
-async def export_csv(resource: str, limit: int = 1000):
-    import csv
-    import io
-
-    collection_map = {
-        "leads": "lead",
-        "chats": "chatmessage",
-        "bookings": "booking",
-        "tickets": "supportticket",
-        "payments": "paymentrecord",
-        "sms": "smsmessage",
-        "calls": "calllog",
-    }
+COLLECTION_MAP = {
+    "leads": "lead",
+    "chats": "chatmessage",
+    "bookings": "booking",
+    "tickets": "supportticket",
+    "payments": "paymentrecord",
+    "sms": "smsmessage",
+    "calls": "calllog",
+}
+
+_EXPORT_SCHEMAS = {
+    "leads": Lead,
+    "chats": ChatMessage,
+    "bookings": Booking,
+    "tickets": SupportTicket,
+    "payments": PaymentRecord,
+    "sms": SmsMessage,
+    "calls": CallLog,
+}
+
+# Static column order per resource: the schema fields plus _id and the
+# timestamps create_document stamps on every insert. Computed once at
+# import so the exporter never scans documents to find headers.
+SCHEMA_FIELDS = {
+    resource: ["_id", *model.model_fields.keys(), "created_at", "updated_at"]
+    for resource, model in _EXPORT_SCHEMAS.items()
+}
 
-    coll = collection_map.get(resource)
-    if not coll:
-        raise HTTPException(status_code=400, detail="Unknown resource")
 
-    docs = get_documents(coll, {}, limit)
+def _row_extractor(fieldnames):
+    # Bind the column tuple once; map(d.get, fields) runs the per-row
+    # column loop in C rather than a Python comprehension per document.
+    fields = tuple(fieldnames)
 
-    if not docs:
-        return ""
+    def extract(d):
+        return map(d.get, fields)
 
-    # Prepare CSV
-    output = io.StringIO()
-    writer = csv.DictWriter(output, fieldnames=sorted({k for d in docs for k in d.keys()}))
-    writer.writeheader()
-    for d in docs:
-        d = {**d}
-        if d.get("_id"):
-            d["_id"] = str(d["_id"])  # stringify ObjectId
-        writer.writerow(d)
+    return extract
 
-    return output.getvalue()
+
+_ROW_EXTRACTORS = {resource: _row_extractor(fields) for resource, fields in SCHEMA_FIELDS.items()}
+
+
+@app.get("/export/{resource}")
+async def export_csv(resource: str, limit: int = 1000):
+    coll = COLLECTION_MAP.get(resource)
+    if not coll:
+        raise HTTPException(status_code=400, detail="Unknown resource")
+
+    fieldnames = SCHEMA_FIELDS[resource]
+    extract_row = _ROW_EXTRACTORS[resource]
+    cursor = iter_documents(coll, {}, limit, sort=_RECENT_FIRST)
+
+    def iter_rows():
+        buf = io.StringIO()
+        # Positional writer: the column order is fixed by SCHEMA_FIELDS,
+        # so skip DictWriter's per-row fieldname lookups.
+        writer = csv.writer(buf)
+        writer.writerow(fieldnames)
+        yield buf.getvalue()
+        buf.seek(0)
+        buf.truncate(0)
+        for d in cursor:
+            writer.writerow(extract_row(d))
+            yield buf.getvalue()
+            buf.seek(0)
+            buf.truncate(0)
+
+    return StreamingResponse(iter_rows(), media_type="text/csv")
 
 # ------------------------------------------------------
 # Twilio: SMS send + webhook; Voice outbound + inbound webhook (TwiML)
@@ -459,18 +745,23 @@ class SmsSendRequest(BaseModel):
 
 @app.post("/sms/send")
 async def sms_send(req: SmsSendRequest):
-    from_number = os.getenv("TWILIO_PHONE_NUMBER")
+    from_number = settings.TWILIO_PHONE_NUMBER
     if not from_number:
         raise HTTPException(status_code=500, detail="TWILIO_PHONE_NUMBER not configured")
 
     client = get_twilio_client()
     try:
-        message = client.messages.create(
+        # Twilio's SDK does a blocking HTTPS round-trip; run it in the
+        # threadpool so it doesn't stall the event loop.
+        message = await run_in_threadpool(
+            client.messages.create,
             body=req.body,
             from_=from_number,
             to=req.to
         )
-        create_document("smsmessage", SmsMessage(
+        # model_construct: fields here are server-built (already validated
+        # or Twilio-provided), so skip Pydantic's validation pass.
+        await acreate_document("smsmessage", SmsMessage.model_construct(
             to=req.to,
             from_number=from_number,
             body=req.body,
@@ -485,26 +776,31 @@ async def sms_send(req: SmsSendRequest):
 
 @app.get("/sms")
 async def list_sms(limit: int = 200):
-    docs = get_documents("smsmessage", {}, limit)
-    for d in docs:
-        d["_id"] = str(d.get("_id"))
+    docs = await aget_documents("smsmessage", {}, limit, projection=_LIST_PROJECTIONS["smsmessage"], sort=_RECENT_FIRST)
     return docs
 
 
+_SMS_REPLY_PREFIX = "Thanks for texting AHC! We received: '"
+_SMS_REPLY_SUFFIX = "'. We'll be in touch shortly."
+
+
 @app.post("/sms/webhook", response_class=PlainTextResponse)
 async def sms_webhook(request: Request):
+    # FormData already behaves like the mapping Twilio signs (last value
+    # per key, .get access), so use it directly instead of copying it
+    # into a dict per request.
     form = await request.form()
-    form_dict = dict(form)
 
-    if not validate_twilio_request(request, form_dict):
+    if not validate_twilio_request(request, form):
         raise HTTPException(status_code=403, detail="Invalid Twilio signature")
 
     from_number = form.get("From")
     to_number = form.get("To")
     body = form.get("Body", "")
 
-    # Save inbound message
-    create_document("smsmessage", SmsMessage(
+    # Log the inbound message via the insert buffer: the write happens
+    # after the TwiML reply is on the wire, off the response path.
+    await insert_buffer.submit("smsmessage", SmsMessage.model_construct(
         to=to_number,
         from_number=from_number,
         body=body,
@@ -512,9 +808,11 @@ async def sms_webhook(request: Request):
         status="received"
     ))
 
-    # Simple auto-reply
+    # Simple auto-reply; only the echoed body varies, so join the
+    # preallocated prefix/suffix around it instead of re-formatting the
+    # whole sentence per message.
     resp = MessagingResponse()
-    resp.message("Thanks for texting AHC! We received: '" + (body or "") + "'. We'll be in touch shortly.")
+    resp.message("".join((_SMS_REPLY_PREFIX, body, _SMS_REPLY_SUFFIX)))
     return str(resp)
 
 
@@ -526,22 +824,26 @@ class CallRequest(BaseModel):
 
 @app.post("/voice/call")
 async def voice_call(req: CallRequest):
-    from_number = os.getenv("TWILIO_PHONE_NUMBER")
+    from_number = settings.TWILIO_PHONE_NUMBER
     if not from_number:
         raise HTTPException(status_code=500, detail="TWILIO_PHONE_NUMBER not configured")
 
     client = get_twilio_client()
     try:
         if req.twiml_url:
-            call = client.calls.create(to=req.to, from_=from_number, url=req.twiml_url)
+            call = await run_in_threadpool(
+                client.calls.create, to=req.to, from_=from_number, url=req.twiml_url
+            )
         else:
             # Use our own endpoint to serve dynamic TwiML greeting
-            base_url = os.getenv("PUBLIC_BACKEND_URL")
+            base_url = settings.public_backend_url
             if not base_url:
                 raise HTTPException(status_code=500, detail="PUBLIC_BACKEND_URL not set for voice callback")
-            call = client.calls.create(to=req.to, from_=from_number, url=f"{base_url}/voice/twiml")
+            call = await run_in_threadpool(
+                client.calls.create, to=req.to, from_=from_number, url=f"{base_url}/voice/twiml"
+            )
 
-        create_document("calllog", CallLog(
+        await acreate_document("calllog", CallLog.model_construct(
             to=req.to,
             from_number=from_number,
             sid=call.sid,
@@ -555,17 +857,49 @@ async def voice_call(req: CallRequest):
 
 @app.get("/calls")
 async def list_calls(limit: int = 200):
-    docs = get_documents("calllog", {}, limit)
-    for d in docs:
-        d["_id"] = str(d.get("_id"))
+    docs = await aget_documents("calllog", {}, limit, projection=_LIST_PROJECTIONS["calllog"], sort=_RECENT_FIRST)
     return docs
 
 
+# The IVR TwiML is static, so build the XML once at import instead of
+# allocating VoiceResponse/Gather trees and re-serializing per call.
+
+def _build_greeting_twiml() -> str:
+    vr = VoiceResponse()
+    base_url = settings.public_backend_url
+    action_path = "/voice/handle-gather"
+    action_url = (base_url + action_path) if base_url else action_path
+
+    gather = Gather(action=action_url, num_digits=1, timeout=6)
+    gather.say("Welcome to A H C front desk. Press 1 to book a demo. Press 2 for support. Press 3 for sales.")
+    vr.append(gather)
+    vr.say("We didn't receive any input. Goodbye.")
+    return str(vr)
+
+
+def _build_say_twiml(text: str) -> str:
+    vr = VoiceResponse()
+    vr.say(text)
+    return str(vr)
+
+
+_TWIML_GREETING = _build_greeting_twiml()
+
+_IVR_RESPONSES = {
+    "1": _build_say_twiml("Great. We'll text you a link to schedule a demo shortly. Goodbye."),
+    "2": _build_say_twiml("Support selected. We will follow up by text. Goodbye."),
+    "3": _build_say_twiml("Sales selected. Our team will reach out. Goodbye."),
+    None: _build_say_twiml("Invalid selection. Goodbye."),
+}
+
+
 @app.post("/voice/twiml", response_class=PlainTextResponse)
 async def voice_twiml(request: Request):
+    # FormData already behaves like the mapping Twilio signs (last value
+    # per key, .get access), so use it directly instead of copying it
+    # into a dict per request.
     form = await request.form()
-    form_dict = dict(form)
-    if not validate_twilio_request(request, form_dict):
+    if not validate_twilio_request(request, form):
         raise HTTPException(status_code=403, detail="Invalid Twilio signature")
 
     # Log inbound call start
@@ -573,7 +907,8 @@ async def voice_twiml(request: Request):
     to_number = form.get("To")
     sid = form.get("CallSid")
     try:
-        create_document("calllog", CallLog(
+        # Buffered write: Twilio gets its TwiML without waiting on Mongo.
+        await insert_buffer.submit("calllog", CallLog.model_construct(
             to=to_number,
             from_number=from_number,
             sid=sid,
@@ -583,44 +918,49 @@ async def voice_twiml(request: Request):
     except Exception:
         pass
 
-    # Simple IVR greeting and gather
-    vr = VoiceResponse()
-    base_url = os.getenv("PUBLIC_BACKEND_URL", "")
-    action_path = "/voice/handle-gather"
-    action_url = (base_url.rstrip("/") + action_path) if base_url else action_path
-
-    gather = Gather(action=action_url, num_digits=1, timeout=6)
-    gather.say("Welcome to A H C front desk. Press 1 to book a demo. Press 2 for support. Press 3 for sales.")
-    vr.append(gather)
-    vr.say("We didn't receive any input. Goodbye.")
-    return str(vr)
+    # Simple IVR greeting and gather (precomputed XML)
+    return _TWIML_GREETING
 
 
 @app.post("/voice/handle-gather", response_class=PlainTextResponse)
 async def voice_handle_gather(request: Request):
+    # FormData already behaves like the mapping Twilio signs (last value
+    # per key, .get access), so use it directly instead of copying it
+    # into a dict per request.
     form = await request.form()
-    form_dict = dict(form)
-    if not validate_twilio_request(request, form_dict):
+    if not validate_twilio_request(request, form):
         raise HTTPException(status_code=403, detail="Invalid Twilio signature")
 
     digits = form.get("Digits")
     from_number = form.get("From")
     to_number = form.get("To")
 
-    vr = VoiceResponse()
+    # Unrecognized (or missing) selection: nothing to send or log, so
+    # skip the Twilio client and DB work entirely.
+    if digits not in ("1", "2", "3"):
+        return _IVR_RESPONSES.get(digits, _IVR_RESPONSES[None])
+
     client = None
     try:
         client = get_twilio_client()
     except Exception:
         client = None
 
-    twilio_from = os.getenv("TWILIO_PHONE_NUMBER")
+    twilio_from = settings.TWILIO_PHONE_NUMBER
 
-    def safe_sms(to: Optional[str], text: str):
+    # Documents produced by the branches below, grouped by collection and
+    # flushed with one insert_many per collection before returning TwiML.
+    pending: Dict[str, list] = {}
+
+    def queue_doc(collection_name: str, doc):
+        pending.setdefault(collection_name, []).append(doc)
+
+    async def safe_sms(to: Optional[str], text: str):
         if client and twilio_from and to:
             try:
-                client.messages.create(body=text, from_=twilio_from, to=to)
-                create_document("smsmessage", SmsMessage(
+                # Blocking HTTPS call; keep it off the event loop.
+                await run_in_threadpool(client.messages.create, body=text, from_=twilio_from, to=to)
+                queue_doc("smsmessage", SmsMessage.model_construct(
                     to=to,
                     from_number=twilio_from,
                     body=text,
@@ -633,21 +973,20 @@ async def voice_handle_gather(request: Request):
     # Actions per IVR selection
     if digits == "1":
         # Book a demo: send scheduling link via SMS and log a lead
-        safe_sms(from_number, "Thanks for calling AHC! Schedule your demo here: https://cal.com/ahc/demo")
+        await safe_sms(from_number, "Thanks for calling AHC! Schedule your demo here: https://cal.com/ahc/demo")
         try:
-            create_document("lead", Lead(
+            queue_doc("lead", Lead.model_construct(
                 name="Phone Caller",
                 email="caller@unknown.local",
                 inquiry_type="demo",
-                reason="Selected '1' in IVR; phone: " + (from_number or "unknown")
+                reason=f"Selected '1' in IVR; phone: {from_number or 'unknown'}"
             ))
         except Exception:
             pass
-        vr.say("Great. We'll text you a link to schedule a demo shortly. Goodbye.")
     elif digits == "2":
         # Support: create a ticket and send SMS confirmation
         try:
-            create_document("supportticket", SupportTicket(
+            queue_doc("supportticket", SupportTicket.model_construct(
                 name="Phone Caller",
                 email="caller@unknown.local",
                 issue_type="other",
@@ -657,13 +996,12 @@ async def voice_handle_gather(request: Request):
             ))
         except Exception:
             pass
-        safe_sms(from_number, "Support request received. Our team will follow up shortly. Reply here with details.")
-        vr.say("Support selected. We will follow up by text. Goodbye.")
+        await safe_sms(from_number, "Support request received. Our team will follow up shortly. Reply here with details.")
     elif digits == "3":
         # Sales: log a lead and text a sales link
-        safe_sms(from_number, "Thanks! A member of sales will reach out. Learn more: https://example.com/sales")
+        await safe_sms(from_number, "Thanks! A member of sales will reach out. Learn more: https://example.com/sales")
         try:
-            create_document("lead", Lead(
+            queue_doc("lead", Lead.model_construct(
                 name="Phone Caller",
                 email="caller@unknown.local",
                 inquiry_type="purchase",
@@ -671,11 +1009,14 @@ async def voice_handle_gather(request: Request):
             ))
         except Exception:
             pass
-        vr.say("Sales selected. Our team will reach out. Goodbye.")
-    else:
-        vr.say("Invalid selection. Goodbye.")
 
-    return str(vr)
+    for collection_name, docs in pending.items():
+        try:
+            await acreate_documents(collection_name, docs)
+        except Exception:
+            pass
+
+    return _IVR_RESPONSES.get(digits, _IVR_RESPONSES[None])
 
 
 # Health for Twilio webhooks GET (optional)
@@ -692,4 +1033,9 @@ async def voice_twiml_get():
 if __name__ == "__main__":
     import uvicorn
     port = int(os.getenv("PORT", 8000))
-    uvicorn.run(app, host="0.0.0.0", port=port)
+    # One process per core-ish (overridable via WEB_CONCURRENCY) so CPU
+    # work like Argon2 and CSV generation scales past a single core.
+    # Multi-worker mode needs the import-string form, not the app object.
+    workers = int(os.getenv("WEB_CONCURRENCY", 2 * (os.cpu_count() or 1) + 1))
+    uvicorn.run("main:app", host="0.0.0.0", port=port, workers=workers,
+                loop="uvloop", http="httptools")
@@ -169,3 +169,12 @@ class Product(BaseModel):
     price: float = Field(..., ge=0, description="Price in dollars")
     category: str = Field(..., description="Product category")
     in_stock: bool = Field(True, description="Whether product is in stock")
+
+# ---------------------------------------------------------------------
+# Eagerly compile the core schemas at import so the first request does
+# not pay Pydantic's lazy schema-build cost.
+# ---------------------------------------------------------------------
+
+for _model in (Lead, ChatMessage, Booking, SupportTicket, PaymentRecord,
+               SmsMessage, CallLog, AuthUser, Organization, Membership):
+    _model.model_rebuild()
@@ -0,0 +1,81 @@
+"""
+Batched Mongo Writer
+
+In-process micro-batching for high-volume insert paths. Handlers queue
+documents per collection and a single background task flushes them with
+insert_many every few hundred documents or few tens of milliseconds,
+collapsing one-round-trip-per-request into one per batch. Callers get
+the _id back immediately because it is generated client-side.
+"""
+
+import asyncio
+from datetime import datetime, timezone
+from typing import Optional, Union
+
+from bson import ObjectId
+from pydantic import BaseModel
+
+from database import adb
+
+FLUSH_MAX_DOCS = 500
+FLUSH_INTERVAL_SECONDS = 0.05
+
+
+class InsertBuffer:
+    """Queue documents per collection and flush them in batches."""
+
+    def __init__(self, flush_max_docs: int = FLUSH_MAX_DOCS, flush_interval: float = FLUSH_INTERVAL_SECONDS):
+        self._queue: "asyncio.Queue[tuple]" = asyncio.Queue()
+        self._flush_max_docs = flush_max_docs
+        self._flush_interval = flush_interval
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        """Start the background flush task (call once, on app startup)."""
+        if self._task is None:
+            self._task = asyncio.get_event_loop().create_task(self._run())
+
+    async def submit(self, collection_name: str, data: Union[BaseModel, dict]) -> str:
+        """Queue one document for insertion and return its _id immediately.
+
+        The _id is generated client-side, so callers don't wait for the
+        batch to reach Mongo (fire-and-forget, like write_concern=0).
+        """
+        if adb is None:
+            raise Exception("Database not available. Check DATABASE_URL and DATABASE_NAME environment variables.")
+
+        data_dict = data.model_dump() if isinstance(data, BaseModel) else data.copy()
+        data_dict.setdefault('_id', ObjectId())
+        now = datetime.now(timezone.utc)
+        data_dict['created_at'] = now
+        data_dict['updated_at'] = now
+        await self._queue.put((collection_name, data_dict))
+        return str(data_dict['_id'])
+
+    async def _run(self):
+        loop = asyncio.get_event_loop()
+        while True:
+            collection_name, doc = await self._queue.get()
+            batches = {collection_name: [doc]}
+            count = 1
+            deadline = loop.time() + self._flush_interval
+            while count < self._flush_max_docs:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    collection_name, doc = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                batches.setdefault(collection_name, []).append(doc)
+                count += 1
+            for collection_name, docs in batches.items():
+                try:
+                    await adb[collection_name].insert_many(docs, ordered=False)
+                except Exception:
+                    # These are log-style records; keep the writer alive
+                    # rather than crash on a bad batch.
+                    pass
+
+
+insert_buffer = InsertBuffer()